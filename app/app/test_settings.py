@@ -0,0 +1,18 @@
+"""
+Django settings for running the test suite without Postgres.
+
+Usage: python manage.py test --settings=app.test_settings
+"""
+from app.settings import *  # noqa: F401,F403
+
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    }
+}
+
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+]
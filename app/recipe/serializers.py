@@ -1,11 +1,16 @@
 """
 Serializers for recipe API.
 """
+from copy import copy, deepcopy
+
 from rest_framework import serializers
 
 from core.models import Recipe, Tag, Ingredient
 
 
+_FIELDS_CACHE = {}
+
+
 class IngredientSerializer(serializers.ModelSerializer):
     "Serializer for ingredients."
 
@@ -24,30 +29,54 @@ class TagSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(serializers.Serializer):
     """Serializer for recipes."""
+    id = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(max_length=255)
+    time_minutes = serializers.IntegerField(min_value=-2147483648, max_value=2147483647)
+    price = serializers.DecimalField(max_digits=5, decimal_places=2)
+    link = serializers.CharField(max_length=255, required=False, allow_blank=True)
     tags = TagSerializer(many=True, required=False)
     ingredients = IngredientSerializer(many=True, required=False)
 
     class Meta:
-        model = Recipe
-        exclude = ["user", "description", "image"]
-        read_only_fields = ["id"]
+        fields_for_only = ["id", "title", "time_minutes", "price", "link"]
+
+    def get_fields(self):
+        """Return a copy of the fields built once per serializer class.
+
+        Nested serializers are deep copied so their children bind to this instance.
+        """
+        cls = self.__class__
+        cached = _FIELDS_CACHE.get(cls)
+        if cached is None:
+            cached = super().get_fields()
+            _FIELDS_CACHE[cls] = cached
+        return {
+            name: deepcopy(field) if isinstance(field, serializers.BaseSerializer) else copy(field)
+            for name, field in cached.items()
+        }
+
+    def _get_or_create_objects(self, model, items):
+        """Return the user's objects matching items, creating the missing ones in bulk."""
+        auth_user = self.context["request"].user
+        names = {item["name"] for item in items}
+        if not names:
+            return []
+        queryset = model.objects.filter(user=auth_user, name__in=names)
+        missing = names - set(queryset.values_list("name", flat=True))
+        if missing:
+            model.objects.bulk_create([model(user=auth_user, name=name) for name in missing])
+        return list(queryset)
 
     def _get_or_create_tags(self, tags, recipe):
         """Handle getting or creating tags as needed."""
-        auth_user = self.context["request"].user
-        for tag in tags:
-            tag_obj, created = Tag.objects.get_or_create(user=auth_user, **tag)
-            recipe.tags.add(tag_obj)
+        recipe.tags.add(*self._get_or_create_objects(Tag, tags))
         return recipe
 
     def _get_or_create_ingredients(self, ingredients, recipe):
         """Handle getting or creating ingredients as needed."""
-        auth_user = self.context["request"].user
-        for ingredient in ingredients:
-            ingredient_obj, created = Ingredient.objects.get_or_create(user=auth_user, **ingredient)
-            recipe.ingredients.add(ingredient_obj)
+        recipe.ingredients.add(*self._get_or_create_objects(Ingredient, ingredients))
         return recipe
 
     def create(self, validated_data):
@@ -75,11 +104,13 @@ class RecipeSerializer(serializers.ModelSerializer):
         return instance
 
 
-class RecipeDetailSerializer(RecipeSerializer):
+class RecipeDetailSerializer(RecipeSerializer, serializers.ModelSerializer):
     """Serializer for recipe detail view."""
 
-    class Meta(RecipeSerializer.Meta):
+    class Meta:
+        model = Recipe
         exclude = ["user"]
+        read_only_fields = ["id"]
 
 
 class RecipeImageSerializer(serializers.ModelSerializer):
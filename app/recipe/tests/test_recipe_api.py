@@ -6,11 +6,11 @@ import os
 from PIL import Image
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
 
 from rest_framework import status
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory
 
 from core.models import Recipe, Tag, Ingredient
 
@@ -18,38 +18,57 @@ from recipe.serializers import RecipeSerializer, RecipeDetailSerializer
 
 
 RECIPES_URL = reverse("recipe:recipe-list")
+RECIPE_DETAIL_URL = reverse("recipe:recipe-detail", args=[99999999]).replace("99999999", "{pk}")
+IMAGE_UPLOAD_URL = reverse("recipe:recipe-upload-image", args=[99999999]).replace("99999999", "{pk}")
+DEFAULT_PRICE = Decimal("5.25")
+CREATE_RECIPE_PAYLOAD = {
+    "title": "Sample recipe",
+    "time_minutes": 30,
+    "price": Decimal("5.99")
+}
 
 
 def detail_url(recipe_id):
     """Create and return a recipe detail URL."""
-    return reverse("recipe:recipe-detail", args=[recipe_id])
+    return RECIPE_DETAIL_URL.format(pk=recipe_id)
 
 
 def image_upload_url(recipe_id):
     """Create and return an image upload URL."""
-    return reverse("recipe:recipe-upload-image", args=[recipe_id])
+    return IMAGE_UPLOAD_URL.format(pk=recipe_id)
 
 
-def create_recipe(user, **params):
-    """Create and return a sample recipe."""
+def build_recipe(user, **params):
+    """Build and return an unsaved sample recipe."""
     defaults = {
         "title": "Sample recipe title",
         "time_minutes": 22,
-        "price": Decimal("5.25"),
+        "price": DEFAULT_PRICE,
         "description": "Sample description",
         "link": "http://example.com/recipe.pdf"
     }
     defaults.update(params)
-    recipe = Recipe.objects.create(user=user, **defaults)
+    return Recipe(user=user, **defaults)
+
+
+def create_recipe(user, **params):
+    """Create and return a sample recipe."""
+    recipe = build_recipe(user, **params)
+    recipe.save()
     return recipe
 
 
+def create_recipes(user, n, **params):
+    """Create n sample recipes in a single query."""
+    Recipe.objects.bulk_create([build_recipe(user, **params) for _ in range(n)])
+
+
 def create_user(**params):
     """Create and return a new user."""
     return get_user_model().objects.create_user(**params)
 
 
-class PublicRecipeAPITests(TestCase):
+class PublicRecipeAPITests(SimpleTestCase):
     """Test unauthenticated API requests."""
 
     def setUp(self):
@@ -61,56 +80,76 @@ class PublicRecipeAPITests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
 class PrivateRecipeAPITests(TestCase):
     """Test authenticated API requests."""
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email="user@exampe.com", password="testpass123")
 
     def setUp(self):
-        self.client = APIClient()
-        self.user = create_user(email="user@exampe.com", password="testpass123")
         self.client.force_authenticate(self.user)
 
     def test_retrieve_recipes(self):
         """Test retrieving a list of recipes."""
-        create_recipe(user=self.user)
-        create_recipe(user=self.user)
-        response = self.client.get(RECIPES_URL)
-        recipes = Recipe.objects.all().order_by("-id")
-        serializer = RecipeSerializer(recipes, many=True)
+        create_recipes(self.user, 2)
+        with self.assertNumQueries(3):  # recipes, tags and ingredients
+            response = self.client.get(RECIPES_URL)
+        ids = list(Recipe.objects.order_by("-id").values_list("id", flat=True))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual([item["id"] for item in response.data], ids)
+        self.assertEqual({item["title"] for item in response.data}, {"Sample recipe title"})
 
     def test_recipe_list_limited_to_user(self):
         """Test list of recipes is limited to authenticated user."""
         other_user = create_user(email="other@exampe.com", password="test123")
         create_recipe(user=other_user)
-        create_recipe(user=self.user)
+        recipe = create_recipe(user=self.user)
         response = self.client.get(RECIPES_URL)
-        recipes = Recipe.objects.filter(user=self.user)
-        serializer = RecipeSerializer(recipes, many=True)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data, [{
+            "id": recipe.id,
+            "title": recipe.title,
+            "time_minutes": recipe.time_minutes,
+            "price": str(recipe.price),
+            "link": recipe.link,
+            "tags": [],
+            "ingredients": []
+        }])
 
     def test_get_recipe_detail(self):
         """Test get recipe detail."""
         recipe = create_recipe(user=self.user)
         url = detail_url(recipe.id)
         response = self.client.get(url)
-        serializer = RecipeDetailSerializer(recipe)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data, {
+            "id": recipe.id,
+            "title": recipe.title,
+            "description": recipe.description,
+            "time_minutes": recipe.time_minutes,
+            "price": str(recipe.price),
+            "link": recipe.link,
+            "tags": [],
+            "ingredients": [],
+            "image": None
+        })
 
     def test_create_recipe(self):
         """Test creating a recipe."""
-        payload = {
-            "title": "Sample recipe",
-            "time_minutes": 30,
-            "price": Decimal("5.99")
-        }
+        payload = CREATE_RECIPE_PAYLOAD
         response = self.client.post(RECIPES_URL, payload)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        recipe = Recipe.objects.get(id=response.data["id"])
-        for k, v in payload.items():
-            self.assertEqual(getattr(recipe, k), v)
-        self.assertEqual(recipe.user, self.user)
+        row = Recipe.objects.values("user", *payload).get(id=response.data["id"])
+        self.assertEqual(row, {"user": self.user.id, **payload})
+
+    def test_create_recipe_time_minutes_out_of_range_error(self):
+        """Test creating a recipe with time_minutes outside the integer column range fails."""
+        payload = {**CREATE_RECIPE_PAYLOAD, "time_minutes": 3000000000}
+        response = self.client.post(RECIPES_URL, payload)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Recipe.objects.filter(user=self.user).exists())
 
     def test_partial_update(self):
         """Test partial update of a recipe."""
@@ -143,10 +182,8 @@ class PrivateRecipeAPITests(TestCase):
         url = detail_url(recipe.id)
         response = self.client.put(url, payload)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        for k, v in payload.items():
-            self.assertEqual(getattr(recipe, k), v)
-        self.assertEqual(recipe.user, self.user)
+        row = Recipe.objects.values("user", *payload).get(id=recipe.id)
+        self.assertEqual(row, {"user": self.user.id, **payload})
 
     def test_update_user_returns_error(self):
         """Test changing the recipe user results in an error."""
@@ -188,14 +225,11 @@ class PrivateRecipeAPITests(TestCase):
         }
         response = self.client.post(RECIPES_URL, payload, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        tags = Tag.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
-        self.assertEqual(tags.count(), 2)
-        recipe = recipes.first()
-        self.assertEqual(recipe.tags.count(), 2)
-        for tag in payload["tags"]:
-            self.assertTrue(recipe.tags.filter(user=self.user, name=tag["name"]).exists())
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+        recipe = Recipe.objects.prefetch_related("tags").get(user=self.user)
+        self.assertEqual(len(recipe.tags.all()), 2)
+        tag_owners = {(tag.name, tag.user_id) for tag in recipe.tags.all()}
+        self.assertEqual(tag_owners, {(tag["name"], self.user.id) for tag in payload["tags"]})
 
     def test_create_recipe_with_existing_tags(self):
         """Test creating a recipe with existing tag."""
@@ -211,15 +245,12 @@ class PrivateRecipeAPITests(TestCase):
         }
         response = self.client.post(RECIPES_URL, payload, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        tags = Tag.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
-        self.assertEqual(tags.count(), 2)
-        recipe = recipes.first()
-        self.assertEqual(recipe.tags.count(), 2)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+        recipe = Recipe.objects.prefetch_related("tags").get(user=self.user)
+        self.assertEqual(len(recipe.tags.all()), 2)
+        tag_owners = {(tag.name, tag.user_id) for tag in recipe.tags.all()}
+        self.assertEqual(tag_owners, {(tag["name"], self.user.id) for tag in payload["tags"]})
         self.assertIn(tag_indian, recipe.tags.all())
-        for tag in payload["tags"]:
-            self.assertTrue(recipe.tags.filter(user=self.user, name=tag["name"]).exists())
 
     def test_create_tag_on_update(self):
         """Test creating tag when updating a recipe."""
@@ -274,14 +305,12 @@ class PrivateRecipeAPITests(TestCase):
         }
         response = self.client.post(RECIPES_URL, payload, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        ingredients = Ingredient.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
-        self.assertEqual(ingredients.count(), 2)
-        recipe = recipes.first()
-        self.assertEqual(recipe.ingredients.count(), 2)
-        for ingredient in payload["ingredients"]:
-            self.assertTrue(recipe.ingredients.filter(user=self.user, name=ingredient["name"]).exists())
+        self.assertEqual(Ingredient.objects.filter(user=self.user).count(), 2)
+        recipe = Recipe.objects.prefetch_related("ingredients").get(user=self.user)
+        self.assertEqual(len(recipe.ingredients.all()), 2)
+        ingredient_owners = {(ingredient.name, ingredient.user_id) for ingredient in recipe.ingredients.all()}
+        expected = {(ingredient["name"], self.user.id) for ingredient in payload["ingredients"]}
+        self.assertEqual(ingredient_owners, expected)
 
     def test_create_recipe_with_existing_ingredients(self):
         """Test creating a recipe with existing ingredient."""
@@ -297,15 +326,13 @@ class PrivateRecipeAPITests(TestCase):
         }
         response = self.client.post(RECIPES_URL, payload, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        ingredients = Ingredient.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
-        self.assertEqual(ingredients.count(), 2)
-        recipe = recipes.first()
-        self.assertEqual(recipe.ingredients.count(), 2)
+        self.assertEqual(Ingredient.objects.filter(user=self.user).count(), 2)
+        recipe = Recipe.objects.prefetch_related("ingredients").get(user=self.user)
+        self.assertEqual(len(recipe.ingredients.all()), 2)
+        ingredient_owners = {(ingredient.name, ingredient.user_id) for ingredient in recipe.ingredients.all()}
+        expected = {(ingredient["name"], self.user.id) for ingredient in payload["ingredients"]}
+        self.assertEqual(ingredient_owners, expected)
         self.assertIn(ingredient, recipe.ingredients.all())
-        for ingredient in payload["ingredients"]:
-            self.assertTrue(recipe.ingredients.filter(user=self.user, name=ingredient["name"]).exists())
 
     def test_create_ingredient_on_update(self):
         """Test creating an ingredient when updating a recipe."""
@@ -384,6 +411,23 @@ class PrivateRecipeAPITests(TestCase):
         self.assertNotIn(serializer3.data, response.data)
 
 
+class RecipeSerializerTests(SimpleTestCase):
+    """Test the recipe serializers."""
+
+    def test_nested_serializers_bound_to_instance(self):
+        """Test nested serializers get the context and partial flag of each instance."""
+        request = APIRequestFactory().patch(RECIPES_URL)
+        for serializer_class in [RecipeSerializer, RecipeDetailSerializer]:
+            serializer = serializer_class(context={"request": request}, partial=True)
+            other = serializer_class()
+            for name in ["tags", "ingredients"]:
+                child = serializer.fields[name].child
+                self.assertIs(child.root, serializer)
+                self.assertIs(child.context["request"], request)
+                self.assertTrue(child.root.partial)
+                self.assertIsNot(other.fields[name].child, child)
+
+
 class ImageUploadTests(TestCase):
     """Tests for the image upload API."""
 
@@ -2,7 +2,7 @@
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 
 from rest_framework import status
@@ -14,11 +14,12 @@ from recipe.serializers import TagSerializer
 
 
 TAGS_URL = reverse("recipe:tag-list")
+TAG_DETAIL_URL = reverse("recipe:tag-detail", args=[99999999]).replace("99999999", "{pk}")
 
 
 def detail_url(tag_id):
     """Create and return a tag detail URL."""
-    return reverse("recipe:tag-detail", args=[tag_id])
+    return TAG_DETAIL_URL.format(pk=tag_id)
 
 
 def create_user(email="user@example.com", password="testpass123"):
@@ -26,7 +27,7 @@ def create_user(email="user@example.com", password="testpass123"):
     return get_user_model().objects.create_user(email, password)
 
 
-class PublicTagAPITests(TestCase):
+class PublicTagAPITests(SimpleTestCase):
     """Test unauthenticated API requests."""
 
     def setUp(self):
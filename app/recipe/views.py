@@ -55,6 +55,10 @@ class RecipeViewSet(viewsets.ModelViewSet):
         if ingredients_param:
             ingredient_ids = self._param_to_ints(ingredients_param)
             queryset = queryset.filter(ingredients__id__in=ingredient_ids)
+        if self.action == "list":
+            queryset = queryset.only(
+                *serializers.RecipeSerializer.Meta.fields_for_only
+            ).prefetch_related("tags", "ingredients")
         return queryset.filter(user=self.request.user).order_by("-id").distinct()
 
     def get_serializer_class(self):
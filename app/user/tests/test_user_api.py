@@ -1,7 +1,7 @@
 """
 Tests for the user API.
 """
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
@@ -19,6 +19,7 @@ def create_user(**params):
     return get_user_model().objects.create_user(**params)
 
 
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
 class PublicUserApiTests(TestCase):
     """Test the public features of the user API."""
 
@@ -108,17 +109,28 @@ class PublicUserApiTests(TestCase):
         self.assertNotIn("token", response.data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+
+class PublicUserAuthTests(SimpleTestCase):
+    """Test the public user API requests that do not touch the database."""
+
+    def setUp(self):
+        self.client = APIClient()
+
     def test_retrieve_user_unauthorized(self):
         """Test authentication is required for users."""
         response = self.client.get(ME_URL)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
 class PrivateUserApiTest(TestCase):
     """Test API requests that require authentication."""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email="test@example.com", password="testpass123", name="Test Name")
+
     def setUp(self):
-        self.user = create_user(email="test@example.com", password="testpass123", name="Test Name")
         self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 